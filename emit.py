@@ -1,18 +1,31 @@
+import shutil
+import tempfile
+
+
 class Emitter:
     def __init__(self, outfile):
         self.outfile = outfile
-        self.header = ""
-        self.code = ""
+        # Header lines (includes, declarations) stay in memory because they
+        # are only known once parsing finishes and must precede the code.
+        self.header = []
+        # Code is streamed to a spooled temp file as it is emitted, so the
+        # generated program never has to fit in memory all at once. The
+        # spool only rolls over to disk if max_size is nonzero.
+        self.code = tempfile.SpooledTemporaryFile(max_size=1 << 20, mode="w+")
 
     def emit(self, code):
-        self.code += code
+        self.code.write(code)
 
     def emit_line(self, code):
-        self.code += code + "\n"
+        self.code.write(code)
+        self.code.write("\n")
 
     def header_line(self, code):
-        self.header += code + "\n"
+        self.header.append(code + "\n")
 
     def write_file(self):
         with open(self.outfile, "w") as f:
-            f.write(self.header + self.code)
+            f.writelines(self.header)
+            self.code.seek(0)
+            shutil.copyfileobj(self.code, f)
+        self.code.close()
@@ -1,9 +1,10 @@
 import enum
+import re
 import sys
 from dataclasses import dataclass
 
 
-class TokenType(enum.Enum):
+class TokenType(enum.IntEnum):
     EOF = -1
     NEWLINE = 0
     NUMBER = 1
@@ -35,135 +36,125 @@ class TokenType(enum.Enum):
     GTEQ = 211
 
 
-@dataclass
+# Keywords occupy the 101-200 range of TokenType values.
+_KEYWORDS = {kind.name: kind for kind in TokenType if 100 <= kind.value <= 200}
+
+
+@dataclass(slots=True)
 class Token:
     text: str
     kind: TokenType
 
     @staticmethod
     def is_keyword(text):
-        for kind in TokenType:
-            if kind.name == text and 100 <= kind.value <= 200:
-                return kind
-        return None
+        return _KEYWORDS.get(text)
+
+
+# One alternative per token class. Two-character operators come before
+# their one-character prefixes so the longer match wins.
+_TOKEN_RE = re.compile(
+    r"(?P<SKIP>(?:[ \t\r]+|#[^\n]*)+)"
+    r"|(?P<NUMBER>\d+(?:\.\d+)?)"
+    r"|(?P<IDENT>[A-Za-z][A-Za-z0-9]*)"
+    r'|(?P<STRING>"[^"\n\r\t%]*")'
+    r"|(?P<EQEQ>==)"
+    r"|(?P<NOTEQ>!=)"
+    r"|(?P<LTEQ><=)"
+    r"|(?P<GTEQ>>=)"
+    r"|(?P<EQ>=)"
+    r"|(?P<LT><)"
+    r"|(?P<GT>>)"
+    r"|(?P<PLUS>\+)"
+    r"|(?P<MINUS>-)"
+    r"|(?P<ASTERISK>\*)"
+    r"|(?P<SLASH>/)"
+    r"|(?P<NEWLINE>\n)"
+    r"|(?P<EOF>\0)"
+)
+
+# Group names deliberately mirror TokenType member names.
+_TOKEN_KINDS = {
+    name: TokenType[name]
+    for name in _TOKEN_RE.groupindex
+    if name != "SKIP"
+}
 
 
 class Lexer:
     def __init__(self, input: str):
-        self.source = input + "\n"
-        self.source_len = len(self.source)
-        self.char = ""
-        self.pos = -1
-        self.next_char()
-
-    def next_char(self):
-        self.pos += 1
-        if self.pos >= self.source_len:
-            self.char = "\0"
-        else:
-            self.char = self.source[self.pos]
-
-    def peek(self) -> str:
-        if self.pos + 1 >= self.source_len:
-            return "\0"
-        return self.source[self.pos + 1]
+        # The trailing sentinel lets get_token treat end-of-input as just
+        # another token instead of bounds-checking on every call.
+        self.source = input + "\n\0"
+        self.pos = 0
+        # Identifier lexeme -> Token, so repeated identifiers reuse one
+        # classification and one Token object.
+        self.ident_tokens: dict[str, Token] = {}
 
     def abort(self, message):
         sys.exit("Lexing error. " + message)
 
-    def skip_whitespace(self):
-        while self.char in [" ", "\t", "\r"]:
-            self.next_char()
-
-    def skip_comment(self):
-        if self.char == "#":
-            while self.char != "\n":
-                self.next_char()
-
     def get_token(self):
-        self.skip_whitespace()
-        self.skip_comment()
-        token = None
-        if self.char == "+":
-            token = Token(self.char, TokenType.PLUS)
-        elif self.char == "-":
-            token = Token(self.char, TokenType.MINUS)
-        elif self.char == "*":
-            token = Token(self.char, TokenType.ASTERISK)
-        elif self.char == "/":
-            token = Token(self.char, TokenType.SLASH)
-        elif self.char == "=":
-            if self.peek() == "=":
-                last_char = self.char
-                self.next_char()
-                token = Token(last_char, TokenType.EQEQ)
-            else:
-                token = Token(self.char, TokenType.EQ)
-        elif self.char == ">":
-            # Check whether this is token is > or >=
-            if self.peek() == "=":
-                last_char = self.char
-                self.next_char()
-                token = Token(last_char + self.char, TokenType.GTEQ)
-            else:
-                token = Token(self.char, TokenType.GT)
-        elif self.char == "<":
-            # Check whether this is token is < or <=
-            if self.peek() == "=":
-                last_char = self.char
-                self.next_char()
-                token = Token(last_char + self.char, TokenType.LTEQ)
-            else:
-                token = Token(self.char, TokenType.LT)
-        elif self.char == "!":
-            if self.peek() == "=":
-                last_char = self.char
-                self.next_char()
-                token = Token(last_char + self.char, TokenType.NOTEQ)
-            else:
-                self.abort("Expected !=, got !" + self.peek())
-        elif self.char == '"':
-            self.next_char()
-            start = self.pos
-
-            while self.char != '"':
-                if self.char in ("\r", "\t", "\n", "//", "%"):
-                    self.abort("Illegal character in string.")
-                self.next_char()
-            text = self.source[start : self.pos]
-            token = Token(text, TokenType.STRING)
-        elif self.char.isdigit():
-            start = self.pos
-            while self.peek().isdigit():
-                self.next_char()
-            if self.peek() == ".":
-                self.next_char()
-                if not self.peek().isdigit():
-                    self.abort(f"illegal character in number at {self.pos}")
-                while self.peek().isdigit():
-                    self.next_char()
-            text = self.source[start : self.pos + 1]
-            token = Token(text, TokenType.NUMBER)
-        elif self.char.isalpha():
-            start = self.pos
-            while self.peek().isalnum():
-                self.next_char()
-
-            text = self.source[start : self.pos + 1]
-            keyword = Token.is_keyword(text)
-            if keyword is None:
-                token = Token(text, TokenType.IDENT)
-            else:
-                token = Token(text, keyword)
-        elif self.char == "\n":
-            token = Token(self.char, TokenType.NEWLINE)
-        elif self.char == "\0":
-            token = Token(self.char, TokenType.EOF)
-        else:
-            self.abort("Unknown token: " + self.char)
-
-        self.next_char()
-        return token
+        # Bind the hot attributes to locals; pos is written back only when
+        # a token is actually produced.
+        source = self.source
+        pos = self.pos
+        match_token = _TOKEN_RE.match
+        while True:
+            match = match_token(source, pos)
+            if match is None:
+                self.abort_at(pos)
+            pos = match.end()
+            group = match.lastgroup
+            if group == "SKIP":
+                continue
+            if group == "EOF":
+                # Stay on the sentinel so every later call returns EOF too.
+                self.pos = match.start()
+                return Token("\0", TokenType.EOF)
+            self.pos = pos
+            if group == "IDENT":
+                text = match.group()
+                token = self.ident_tokens.get(text)
+                if token is None:
+                    keyword = Token.is_keyword(text)
+                    if keyword is None:
+                        token = Token(text, TokenType.IDENT)
+                    else:
+                        token = Token(text, keyword)
+                    self.ident_tokens[text] = token
+                return token
+            if group == "STRING":
+                # Slice the body straight out of the source, dropping the
+                # surrounding quotes without an intermediate copy.
+                text = source[match.start() + 1 : match.end() - 1]
+                return Token(text, TokenType.STRING)
+            return Token(match.group(), _TOKEN_KINDS[group])
+
+    def tokenize(self):
+        # Lex the whole source up front into a flat list, EOF token last,
+        # so consumers can walk tokens by index.
+        tokens = []
+        get_token = self.get_token
+        append = tokens.append
+        token = get_token()
+        while token.kind is not TokenType.EOF:
+            append(token)
+            token = get_token()
+        append(token)
+        return tokens
+
+    def abort_at(self, pos):
+        # The token pattern rejected the input; figure out why.
+        char = self.source[pos]
+        if char == '"':
+            # C-level substring search to tell a missing closing quote
+            # apart from an illegal character inside the string.
+            if self.source.find('"', pos + 1) == -1:
+                self.abort("String not terminated.")
+            self.abort("Illegal character in string.")
+        elif char == "!":
+            self.abort("Expected !=, got !" + self.source[pos + 1 : pos + 2])
+        self.abort("Unknown token: " + char)
 
 
 def main():
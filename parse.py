@@ -19,52 +19,77 @@ primary ::= number | ident
 nl ::= '\n'+
 """
 
+_CMP_OPS = frozenset(
+    {
+        TokenType.GT,
+        TokenType.LT,
+        TokenType.GTEQ,
+        TokenType.LTEQ,
+        TokenType.EQEQ,
+        TokenType.NOTEQ,
+    }
+)
+_ADD_OPS = frozenset({TokenType.PLUS, TokenType.MINUS})
+_MUL_OPS = frozenset({TokenType.ASTERISK, TokenType.SLASH})
+
 
 class Parser:
     def __init__(self, lexer: lex.Lexer, emitter):
-        self.lex = lexer
         self.emitter = emitter
-        self.current_token = None
-        self.peek_token = None
-
-        self.symbols = set()
-        self.labels_declared = set()
-        self.labels_gotoed = set()
+        # Lex everything up front; next_token is then an index bump into
+        # a flat list instead of a call back into the lexer.
+        self.tokens = lexer.tokenize()
+        self.token_index = 0
+        # Seed both with the trailing EOF token so they are always Tokens,
+        # never None; the two next_token calls below load the real ones.
+        self.current_token = self.tokens[-1]
+        self.peek_token = self.tokens[-1]
+
+        self.symbols: set[str] = set()
+        self.labels_declared: set[str] = set()
+        self.labels_gotoed: set[str] = set()
+
+        # Statement keyword -> handler, so statement() is one dict lookup.
+        self.stmt_dispatch = {
+            TokenType.PRINT: self.statement_print,
+            TokenType.IF: self.statement_if,
+            TokenType.WHILE: self.statement_while,
+            TokenType.LABEL: self.statement_label,
+            TokenType.GOTO: self.statement_goto,
+            TokenType.LET: self.statement_let,
+            TokenType.INPUT: self.statement_input,
+        }
 
         self.next_token()
         self.next_token()
 
-    def check_token(self, kind):
-        return kind == self.current_token.kind
-
-    def check_peek(self, kind):
-        return kind == self.peek_token.kind
-
     def match(self, kind):
-        if not self.check_token(kind):
+        if self.current_token.kind is not kind:
             self.abort(f"Expected {kind.name}, got {self.current_token.kind.name}")
         self.next_token()
 
     def next_token(self):
         self.current_token = self.peek_token
-        self.peek_token = self.lex.get_token()
+        if self.token_index < len(self.tokens):
+            self.peek_token = self.tokens[self.token_index]
+            self.token_index += 1
+        # Past the end, peek_token stays parked on the EOF token.
 
     def abort(self, message):
         sys.exit("Error " + message)
 
     # program ::= {statement}
     def program(self):
-        print("PROGRAM")
         # write the header
         self.emitter.header_line("#include <stdio.h>")
         self.emitter.header_line("int main(void){")
 
         # Clear all newlines before the program begins
-        while self.check_token(TokenType.NEWLINE):
+        while self.current_token.kind is TokenType.NEWLINE:
             self.next_token()
 
         # Parse all the statements in the program.
-        while not self.check_token(TokenType.EOF):
+        while self.current_token.kind is not TokenType.EOF:
             self.statement()
 
         # wrap things up
@@ -76,144 +101,137 @@ class Parser:
                 self.abort("Attempting to GOTO an undeclared label: " + label)
 
     def statement(self):
-        # Check first token to see what kind of statement this is
+        # Dispatch on the first token to see what kind of statement this is
+        handler = self.stmt_dispatch.get(self.current_token.kind)
+        if handler is None:
+            # This is not a valid statement. Error!
+            self.abort(
+                "Invalid statement at "
+                + self.current_token.text
+                + " ("
+                + self.current_token.kind.name
+                + ")"
+            )
+        handler()
 
-        if self.check_token(TokenType.PRINT):
-            print("STATEMENT-PRINT")
-            self.next_token()
-            # Simple string
-            if self.check_token(TokenType.STRING):
-                self.emitter.emit_line(f'printf("{self.current_token.text}\\n");')
-                self.next_token()
-            else:
-                # Expect an expression and print the result as a float.
-                self.emitter.emit('printf("%' + '.2f\\n", (float)(')
-                self.expression()
-                self.emitter.emit_line("));")
-
-        elif self.check_token(TokenType.IF):
-            print("STATEMENT-IF")
-            self.next_token()
-            self.emitter.emit("if(")
-            self.comparison()
+        # newline
+        self.nl()
 
-            self.match(TokenType.THEN)
-            self.nl()
-            self.emitter.emit_line("){")
+    # "PRINT" (expression | string)
+    def statement_print(self):
+        self.next_token()
+        # Simple string
+        if self.current_token.kind is TokenType.STRING:
+            self.emitter.emit_line(f'printf("{self.current_token.text}\\n");')
+            self.next_token()
+        else:
+            # Expect an expression and print the result as a float.
+            self.emitter.emit('printf("%.2f\\n", (float)(')
+            self.expression()
+            self.emitter.emit_line("));")
 
-            while not self.check_token(TokenType.ENDIF):
-                self.statement()
+    # "IF" comparison "THEN" nl {statement} "ENDIF"
+    def statement_if(self):
+        self.next_token()
+        self.emitter.emit("if(")
+        self.comparison()
 
-            self.match(TokenType.ENDIF)
-            self.emitter.emit_line("}")
+        self.match(TokenType.THEN)
+        self.nl()
+        self.emitter.emit_line("){")
 
-        elif self.check_token(TokenType.WHILE):
-            print("STATEMENT-WHILE")
-            self.next_token()
-            self.emitter.emit("while(")
-            self.comparison()
+        while self.current_token.kind is not TokenType.ENDIF:
+            self.statement()
 
-            self.match(TokenType.REPEAT)
-            self.nl()
-            self.emitter.emit_line("){")
+        self.match(TokenType.ENDIF)
+        self.emitter.emit_line("}")
 
-            while not self.check_token(TokenType.ENDWHILE):
-                self.statement()
+    # "WHILE" comparison "REPEAT" nl {statement} "ENDWHILE"
+    def statement_while(self):
+        self.next_token()
+        self.emitter.emit("while(")
+        self.comparison()
 
-            self.match(TokenType.ENDWHILE)
-            self.emitter.emit_line("}")
+        self.match(TokenType.REPEAT)
+        self.nl()
+        self.emitter.emit_line("){")
 
-        # "LABEL" ident
-        elif self.check_token(TokenType.LABEL):
-            print("STATEMENT-LABEL")
-            self.next_token()
-            if self.current_token.text in self.labels_declared:
-                self.abort(f"Label already exists: {self.current_token.text}")
-            self.labels_declared.add(self.current_token.text)
-            self.emitter.emit_line(self.current_token.text + ":")
-            self.match(TokenType.IDENT)
-
-        # "GOTO" ident
-        elif self.check_token(TokenType.GOTO):
-            print("STATEMENT-GOTO")
-            self.next_token()
-            self.labels_gotoed.add(self.current_token.text)
-            self.emitter.emit_line("goto " + self.current_token.text + ";")
-            self.match(TokenType.IDENT)
+        while self.current_token.kind is not TokenType.ENDWHILE:
+            self.statement()
 
-        # "LET" ident "=" expression
-        elif self.check_token(TokenType.LET):
-            print("STATEMENT-LET")
-            self.next_token()
+        self.match(TokenType.ENDWHILE)
+        self.emitter.emit_line("}")
 
-            #  Check if ident exists in symbol table. If not, declare it.
-            if self.current_token.text not in self.symbols:
-                self.symbols.add(self.current_token.text)
-                self.emitter.header_line("float " + self.current_token.text + ";")
+    # "LABEL" ident
+    def statement_label(self):
+        self.next_token()
+        if self.current_token.text in self.labels_declared:
+            self.abort(f"Label already exists: {self.current_token.text}")
+        self.labels_declared.add(self.current_token.text)
+        self.emitter.emit_line(self.current_token.text + ":")
+        self.match(TokenType.IDENT)
+
+    # "GOTO" ident
+    def statement_goto(self):
+        self.next_token()
+        self.labels_gotoed.add(self.current_token.text)
+        self.emitter.emit_line("goto " + self.current_token.text + ";")
+        self.match(TokenType.IDENT)
 
-            self.emitter.emit(self.current_token.text + " = ")
-            self.match(TokenType.IDENT)
-            self.match(TokenType.EQ)
+    # "LET" ident "=" expression
+    def statement_let(self):
+        self.next_token()
+        name = self.current_token.text
 
-            self.expression()
-            self.emitter.emit_line(";")
+        #  Check if ident exists in symbol table. If not, declare it.
+        if name not in self.symbols:
+            self.symbols.add(name)
+            self.emitter.header_line(f"float {name};")
 
-        # "INPUT" ident
-        elif self.check_token(TokenType.INPUT):
-            print("STATEMENT-INPUT")
-            self.next_token()
+        self.emitter.emit(f"{name} = ")
+        self.match(TokenType.IDENT)
+        self.match(TokenType.EQ)
 
-            if self.current_token.text not in self.symbols:
-                self.symbols.add(self.current_token.text)
-                self.emitter.header_line("float " + self.current_token.text + ";")
+        self.expression()
+        self.emitter.emit_line(";")
 
-            # Emit scanf but also validate the input. If invalid, set the variable to 0 and clear the input.
-            self.emitter.emit_line(
-                f'if(0 == scanf("%f", &{self.current_token.text})) {{'
-            )
-            self.emitter.emit_line(f"{self.current_token.text} = 0;")
-            self.emitter.emit('scanf("%')
-            self.emitter.emit_line('*s");')
-            self.emitter.emit_line("}")
-            self.match(TokenType.IDENT)
+    # "INPUT" ident
+    def statement_input(self):
+        self.next_token()
+        name = self.current_token.text
 
-        # This is not a valid statement. Error!
-        else:
-            self.abort(
-                "Invalid statement at "
-                + self.current_token.text
-                + " ("
-                + self.current_token.kind.name
-                + ")"
-            )
+        if name not in self.symbols:
+            self.symbols.add(name)
+            self.emitter.header_line(f"float {name};")
 
-        # newline
-        self.nl()
+        # Emit scanf but also validate the input. If invalid, set the variable to 0 and clear the input.
+        self.emitter.emit_line(
+            f'if(0 == scanf("%f", &{name})) {{\n{name} = 0;\nscanf("%*s");\n}}'
+        )
+        self.match(TokenType.IDENT)
 
     # nl ::= '\n'+
     def nl(self):
         # Require at least one newline.
-        self.match(TokenType.NEWLINE)
-        # But we will allow extra newlines too, of course.
-        while self.check_token(TokenType.NEWLINE):
-            self.next_token()
+        if self.current_token.kind is not TokenType.NEWLINE:
+            self.abort(
+                f"Expected NEWLINE, got {self.current_token.kind.name}"
+            )
+        # But we will allow extra newlines too, of course. Skip the whole
+        # run with one scan over the token list; the trailing EOF token
+        # guarantees the scan stops.
+        tokens = self.tokens
+        i = self.token_index - 1  # index of peek_token
+        while tokens[i].kind is TokenType.NEWLINE:
+            i += 1
+        self.current_token = tokens[i]
+        self.peek_token = tokens[i + 1] if i + 1 < len(tokens) else tokens[i]
+        self.token_index = min(i + 2, len(tokens))
 
     def is_comparison_op(self):
-        return any(
-            self.check_token(k)
-            for k in [
-                TokenType.GT,
-                TokenType.LT,
-                TokenType.GTEQ,
-                TokenType.LTEQ,
-                TokenType.EQEQ,
-                TokenType.NOTEQ,
-            ]
-        )
+        return self.current_token.kind in _CMP_OPS
 
     def comparison(self):
-        print("COMPARISON")
-
         self.expression()
 
         if self.is_comparison_op():
@@ -231,37 +249,32 @@ class Parser:
 
     def expression(self):
         # expression ::= term {( "-" | "+" ) term}
-        print("EXPRESSION")
         self.term()
 
-        while self.check_token(TokenType.PLUS) or self.check_token(TokenType.MINUS):
+        while self.current_token.kind in _ADD_OPS:
             self.emitter.emit(self.current_token.text)
             self.next_token()
             self.term()
 
     def term(self):
-        print("TERM")
-
         self.unary()
-        while self.check_token(TokenType.ASTERISK) or self.check_token(TokenType.SLASH):
+        while self.current_token.kind in _MUL_OPS:
             self.emitter.emit(self.current_token.text)
             self.next_token()
             self.unary()
 
     def unary(self):
-        print("UNARY")
-        if self.check_token(TokenType.PLUS) or self.check_token(TokenType.MINUS):
+        if self.current_token.kind in _ADD_OPS:
             self.emitter.emit(self.current_token.text)
             self.next_token()
         self.primary()
 
     def primary(self):
-        print(f"PRIMARY ({self.current_token.text})")
-
-        if self.check_token(TokenType.NUMBER):
+        kind = self.current_token.kind
+        if kind is TokenType.NUMBER:
             self.emitter.emit(self.current_token.text)
             self.next_token()
-        elif self.check_token(TokenType.IDENT):
+        elif kind is TokenType.IDENT:
             if self.current_token.text not in self.symbols:
                 self.abort(
                     f"Refrencing variable before assignment: {self.current_token.text}"
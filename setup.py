@@ -0,0 +1,12 @@
+from setuptools import setup
+
+from mypyc.build import mypycify
+
+# Optional: compile the hot modules to C extensions with mypyc.
+# The compiler runs fine as plain Python; this just buys a constant-factor
+# speedup on long inputs. teenytiny.py picks up the built extensions
+# automatically since they shadow the .py files on import.
+setup(
+    name="teeny-tiny-compiler",
+    ext_modules=mypycify(["lex.py", "parse.py", "emit.py"]),
+)
@@ -10,8 +10,14 @@ def main():
     if len(sys.argv) != 2:
         sys.exit("Error: compiler needs source file as argument.")
 
-    with open(sys.argv[1], "r") as f:
-        input = f.read()
+    # Read in binary and decode once, skipping text mode's incremental
+    # decode and newline translation. UTF-8 so string literals can hold
+    # non-ASCII text, as they always could.
+    with open(sys.argv[1], "rb") as f:
+        try:
+            input = f.read().decode("utf-8")
+        except UnicodeDecodeError:
+            sys.exit("Error: source file is not valid UTF-8.")
 
     lexer = lex.Lexer(input)
     emitter = emit.Emitter("out.c")